@@ -11,61 +11,77 @@ This notebook performs comprehensive Bayesian analysis including:
 
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
 from scipy import stats
-from scipy.stats import beta
+from scipy.special import betaincinv
 import warnings
+import sys
 warnings.filterwarnings('ignore')
 
-# Set style
-plt.style.use('seaborn-v0_8-darkgrid')
-sns.set_palette("husl")
+# Random number generator (seeded so posterior samples are reproducible)
+rng = np.random.default_rng(seed=42)
+
+# Cross-check analytic probabilities against Monte Carlo posterior samples
+VALIDATE_WITH_SAMPLES = False
+
+# Report lines are buffered per section and written to stdout in one call
+out = []
+
+def flush_output():
+    """Write the buffered report lines to stdout and clear the buffer"""
+    sys.stdout.write('\n'.join(out) + '\n')
+    out.clear()
 
 # ============================================================================
 # 1. DATA LOADING
 # ============================================================================
 
-print("="*80)
-print("MARKETING A/B TEST - BAYESIAN STATISTICAL ANALYSIS")
-print("="*80)
+out.append("="*80)
+out.append("MARKETING A/B TEST - BAYESIAN STATISTICAL ANALYSIS")
+out.append("="*80)
 
-# Load data
-df = pd.read_csv('marketing_AB.csv')
+# Load data (typed Parquet copy written by ab_test_prepare_data.py)
+df = pd.read_parquet('marketing_AB.parquet', columns=['test group', 'converted'])
 
-# Separate groups
-ad_group = df[df['test group'] == 'ad']
-psa_group = df[df['test group'] == 'psa']
+# Per-group users and conversions, counted with bincount over the group codes
+group_codes = df['test group'].cat.codes.to_numpy()
+group_labels = df['test group'].cat.categories
+group_totals = pd.DataFrame({
+    'n': np.bincount(group_codes, minlength=len(group_labels)),
+    'conv': np.bincount(group_codes, weights=df['converted'].to_numpy(np.int8),
+                        minlength=len(group_labels)).astype(np.int64)
+}, index=group_labels)
 
 # Extract conversion data
-ad_conversions = ad_group['converted'].sum()
-ad_non_conversions = len(ad_group) - ad_conversions
-n_ad = len(ad_group)
+n_ad = group_totals.loc['ad', 'n']
+ad_conversions = group_totals.loc['ad', 'conv']
+ad_non_conversions = n_ad - ad_conversions
 
-psa_conversions = psa_group['converted'].sum()
-psa_non_conversions = len(psa_group) - psa_conversions
-n_psa = len(psa_group)
+n_psa = group_totals.loc['psa', 'n']
+psa_conversions = group_totals.loc['psa', 'conv']
+psa_non_conversions = n_psa - psa_conversions
 
-print(f"\n📊 Sample Sizes:")
-print(f"   Ad Group:  {n_ad:,} (Conversions: {ad_conversions:,}, Non-conversions: {ad_non_conversions:,})")
-print(f"   PSA Group: {n_psa:,} (Conversions: {psa_conversions:,}, Non-conversions: {psa_non_conversions:,})")
+out.append(f"\n📊 Sample Sizes:")
+out.append(f"   Ad Group:  {n_ad:,} (Conversions: {ad_conversions:,}, Non-conversions: {ad_non_conversions:,})")
+out.append(f"   PSA Group: {n_psa:,} (Conversions: {psa_conversions:,}, Non-conversions: {psa_non_conversions:,})")
 
 # Observed conversion rates
 cr_ad = ad_conversions / n_ad
 cr_psa = psa_conversions / n_psa
 
-print(f"\n📈 Observed Conversion Rates:")
-print(f"   Ad Group:  {cr_ad:.6f} ({cr_ad*100:.4f}%)")
-print(f"   PSA Group: {cr_psa:.6f} ({cr_psa*100:.4f}%)")
-print(f"   Difference: {cr_ad - cr_psa:.6f} ({(cr_ad - cr_psa)*100:.4f}%)")
+out.append(f"\n📈 Observed Conversion Rates:")
+out.append(f"   Ad Group:  {cr_ad:.6f} ({cr_ad*100:.4f}%)")
+out.append(f"   PSA Group: {cr_psa:.6f} ({cr_psa*100:.4f}%)")
+out.append(f"   Difference: {cr_ad - cr_psa:.6f} ({(cr_ad - cr_psa)*100:.4f}%)")
+
+flush_output()
 
 # ============================================================================
 # 2. BETA-BINOMIAL MODEL
 # ============================================================================
 
-print("\n" + "="*80)
-print("BETA-BINOMIAL MODEL")
-print("="*80)
+out.append("\n" + "="*80)
+out.append("BETA-BINOMIAL MODEL")
+out.append("="*80)
 
 # Prior parameters (non-informative uniform prior: Beta(1, 1))
 alpha_prior_ad = 1
@@ -80,114 +96,140 @@ beta_post_ad = beta_prior_ad + ad_non_conversions
 alpha_post_psa = alpha_prior_psa + psa_conversions
 beta_post_psa = beta_prior_psa + psa_non_conversions
 
-print(f"\n📊 Prior Distribution (Non-informative):")
-print(f"   Ad Group:  Beta({alpha_prior_ad}, {beta_prior_ad})")
-print(f"   PSA Group: Beta({alpha_prior_psa}, {beta_prior_psa})")
+out.append(f"\n📊 Prior Distribution (Non-informative):")
+out.append(f"   Ad Group:  Beta({alpha_prior_ad}, {beta_prior_ad})")
+out.append(f"   PSA Group: Beta({alpha_prior_psa}, {beta_prior_psa})")
 
-print(f"\n📊 Posterior Distribution:")
-print(f"   Ad Group:  Beta({alpha_post_ad:.1f}, {beta_post_ad:.1f})")
-print(f"   PSA Group: Beta({alpha_post_psa:.1f}, {beta_post_psa:.1f})")
+out.append(f"\n📊 Posterior Distribution:")
+out.append(f"   Ad Group:  Beta({alpha_post_ad:.1f}, {beta_post_ad:.1f})")
+out.append(f"   PSA Group: Beta({alpha_post_psa:.1f}, {beta_post_psa:.1f})")
 
 # Posterior means (expected conversion rates)
-post_mean_ad = alpha_post_ad / (alpha_post_ad + beta_post_ad)
-post_mean_psa = alpha_post_psa / (alpha_post_psa + beta_post_psa)
+post_total_ad = alpha_post_ad + beta_post_ad
+post_total_psa = alpha_post_psa + beta_post_psa
+post_mean_ad = alpha_post_ad / post_total_ad
+post_mean_psa = alpha_post_psa / post_total_psa
+
+out.append(f"\n📈 Posterior Mean Conversion Rates:")
+out.append(f"   Ad Group:  {post_mean_ad:.6f} ({post_mean_ad*100:.4f}%)")
+out.append(f"   PSA Group: {post_mean_psa:.6f} ({post_mean_psa*100:.4f}%)")
+out.append(f"   Expected Lift: {(post_mean_ad - post_mean_psa) / post_mean_psa * 100:.4f}%")
 
-print(f"\n📈 Posterior Mean Conversion Rates:")
-print(f"   Ad Group:  {post_mean_ad:.6f} ({post_mean_ad*100:.4f}%)")
-print(f"   PSA Group: {post_mean_psa:.6f} ({post_mean_psa*100:.4f}%)")
-print(f"   Expected Lift: {(post_mean_ad - post_mean_psa) / post_mean_psa * 100:.4f}%")
+# Posterior variances: Var = mean * (1 - mean) / (alpha + beta + 1)
+post_var_ad = post_mean_ad * (1 - post_mean_ad) / (post_total_ad + 1)
+post_var_psa = post_mean_psa * (1 - post_mean_psa) / (post_total_psa + 1)
+
+flush_output()
 
 # ============================================================================
 # 3. POSTERIOR DISTRIBUTIONS
 # ============================================================================
 
-print("\n" + "="*80)
-print("POSTERIOR DISTRIBUTION ANALYSIS")
-print("="*80)
+out.append("\n" + "="*80)
+out.append("POSTERIOR DISTRIBUTION ANALYSIS")
+out.append("="*80)
 
-# Generate samples from posterior distributions
+# Monte Carlo is only needed for the difference distribution and the
+# relative lift, which have no closed form. Samples are stored as float32,
+# which is ample for 4-significant-figure summaries and halves the memory
+# traffic of the reductions below.
 n_samples = 100000
-posterior_ad_samples = np.random.beta(alpha_post_ad, beta_post_ad, n_samples)
-posterior_psa_samples = np.random.beta(alpha_post_psa, beta_post_psa, n_samples)
+min_lift = 0.01  # Minimum meaningful relative lift (1%)
+
+def sample_posterior_diff(a1, b1, a2, b2, n_samples, min_lift):
+    """Draw Beta(a1, b1) - Beta(a2, b2) samples and the share with relative lift > min_lift"""
+    p1 = rng.beta(a1, b1, n_samples)
+    p2 = rng.beta(a2, b2, n_samples)
+    diffs = p1 - p2
+    return diffs.astype(np.float32), np.mean(diffs > min_lift * p2)
 
-# Difference distribution
-posterior_diff_samples = posterior_ad_samples - posterior_psa_samples
+posterior_diff_samples, prob_meaningful_lift = sample_posterior_diff(
+    alpha_post_ad, beta_post_ad, alpha_post_psa, beta_post_psa, n_samples, min_lift
+)
 
 # Calculate statistics
-print(f"\n📊 Posterior Distribution Statistics:")
-print(f"   Ad Group Mean: {posterior_ad_samples.mean():.6f}")
-print(f"   Ad Group Std:  {posterior_ad_samples.std():.6f}")
-print(f"   PSA Group Mean: {posterior_psa_samples.mean():.6f}")
-print(f"   PSA Group Std:  {posterior_psa_samples.std():.6f}")
-print(f"   Difference Mean: {posterior_diff_samples.mean():.6f}")
-print(f"   Difference Std:  {posterior_diff_samples.std():.6f}")
+diff_mean = posterior_diff_samples.mean()
+diff_std = posterior_diff_samples.std()
+
+out.append(f"\n📊 Posterior Distribution Statistics:")
+out.append(f"   Ad Group Mean: {post_mean_ad:.6f}")
+out.append(f"   Ad Group Std:  {np.sqrt(post_var_ad):.6f}")
+out.append(f"   PSA Group Mean: {post_mean_psa:.6f}")
+out.append(f"   PSA Group Std:  {np.sqrt(post_var_psa):.6f}")
+out.append(f"   Difference Mean: {diff_mean:.6f}")
+out.append(f"   Difference Std:  {diff_std:.6f}")
+
+flush_output()
 
 # ============================================================================
 # 4. CREDIBLE INTERVALS
 # ============================================================================
 
-print("\n" + "="*80)
-print("CREDIBLE INTERVALS")
-print("="*80)
+out.append("\n" + "="*80)
+out.append("CREDIBLE INTERVALS")
+out.append("="*80)
 
 # 95% Credible intervals
 ci_level = 0.95
 alpha_ci = 1 - ci_level
 
-# For Ad group
-ad_ci_lower = np.percentile(posterior_ad_samples, 100 * alpha_ci / 2)
-ad_ci_upper = np.percentile(posterior_ad_samples, 100 * (1 - alpha_ci / 2))
-
-# For PSA group
-psa_ci_lower = np.percentile(posterior_psa_samples, 100 * alpha_ci / 2)
-psa_ci_upper = np.percentile(posterior_psa_samples, 100 * (1 - alpha_ci / 2))
-
-# For difference
-diff_ci_lower = np.percentile(posterior_diff_samples, 100 * alpha_ci / 2)
-diff_ci_upper = np.percentile(posterior_diff_samples, 100 * (1 - alpha_ci / 2))
-
-print(f"\n📊 {ci_level*100:.0f}% Credible Intervals:")
-print(f"   Ad Group Conversion Rate:")
-print(f"      [{ad_ci_lower:.6f}, {ad_ci_upper:.6f}]")
-print(f"      [{(ad_ci_lower*100):.4f}%, {(ad_ci_upper*100):.4f}%]")
-print(f"   PSA Group Conversion Rate:")
-print(f"      [{psa_ci_lower:.6f}, {psa_ci_upper:.6f}]")
-print(f"      [{(psa_ci_lower*100):.4f}%, {(psa_ci_upper*100):.4f}%]")
-print(f"   Difference (Ad - PSA):")
-print(f"      [{diff_ci_lower:.6f}, {diff_ci_upper:.6f}]")
-print(f"      [{(diff_ci_lower*100):.4f}%, {(diff_ci_upper*100):.4f}%]")
+# For Ad group (exact Beta posterior quantiles via the inverse incomplete beta)
+ad_ci_lower, ad_ci_upper = betaincinv(alpha_post_ad, beta_post_ad, [alpha_ci / 2, 1 - alpha_ci / 2])
+
+# For PSA group (exact Beta posterior quantiles via the inverse incomplete beta)
+psa_ci_lower, psa_ci_upper = betaincinv(alpha_post_psa, beta_post_psa, [alpha_ci / 2, 1 - alpha_ci / 2])
+
+# For difference (no closed form, use posterior samples)
+diff_ci_lower, diff_ci_upper = np.quantile(posterior_diff_samples, [alpha_ci / 2, 1 - alpha_ci / 2])
+
+out.append(f"\n📊 {ci_level*100:.0f}% Credible Intervals:")
+out.append(f"   Ad Group Conversion Rate:")
+out.append(f"      [{ad_ci_lower:.6f}, {ad_ci_upper:.6f}]")
+out.append(f"      [{(ad_ci_lower*100):.4f}%, {(ad_ci_upper*100):.4f}%]")
+out.append(f"   PSA Group Conversion Rate:")
+out.append(f"      [{psa_ci_lower:.6f}, {psa_ci_upper:.6f}]")
+out.append(f"      [{(psa_ci_lower*100):.4f}%, {(psa_ci_upper*100):.4f}%]")
+out.append(f"   Difference (Ad - PSA):")
+out.append(f"      [{diff_ci_lower:.6f}, {diff_ci_upper:.6f}]")
+out.append(f"      [{(diff_ci_lower*100):.4f}%, {(diff_ci_upper*100):.4f}%]")
 
 # Check if credible interval excludes zero
 if diff_ci_lower > 0:
-    print(f"\n✅ Credible interval excludes zero - Ad group is superior")
+    out.append(f"\n✅ Credible interval excludes zero - Ad group is superior")
 elif diff_ci_upper < 0:
-    print(f"\n✅ Credible interval excludes zero - PSA group is superior")
+    out.append(f"\n✅ Credible interval excludes zero - PSA group is superior")
 else:
-    print(f"\n⚠️  Credible interval includes zero - No clear superiority")
+    out.append(f"\n⚠️  Credible interval includes zero - No clear superiority")
+
+flush_output()
 
 # ============================================================================
 # 5. PROBABILITY OF SUPERIORITY
 # ============================================================================
 
-print("\n" + "="*80)
-print("PROBABILITY OF SUPERIORITY")
-print("="*80)
+out.append("\n" + "="*80)
+out.append("PROBABILITY OF SUPERIORITY")
+out.append("="*80)
 
 # Probability that Ad > PSA
-prob_ad_better = np.mean(posterior_ad_samples > posterior_psa_samples)
-prob_psa_better = np.mean(posterior_psa_samples > posterior_ad_samples)
+# With ~n successes/failures both Beta posteriors are effectively normal,
+# so Ad - PSA ~ N(mean_ad - mean_psa, var_ad + var_psa)
+prob_ad_better = stats.norm.sf(0, loc=post_mean_ad - post_mean_psa, scale=np.sqrt(post_var_ad + post_var_psa))
+prob_psa_better = 1 - prob_ad_better
 prob_equal = 1 - prob_ad_better - prob_psa_better
 
-print(f"\n📊 Probability Estimates:")
-print(f"   P(Ad > PSA): {prob_ad_better:.6f} ({prob_ad_better*100:.4f}%)")
-print(f"   P(PSA > Ad): {prob_psa_better:.6f} ({prob_psa_better*100:.4f}%)")
-print(f"   P(Equal):    {prob_equal:.6f} ({prob_equal*100:.4f}%)")
+if VALIDATE_WITH_SAMPLES:
+    prob_ad_better_mc = np.mean(posterior_diff_samples > 0)
+    out.append(f"\n🔍 Monte Carlo check: P(Ad > PSA) = {prob_ad_better_mc:.6f} (analytic: {prob_ad_better:.6f})")
 
-# Probability of meaningful lift (e.g., > 1% relative lift)
-min_lift = 0.01
-prob_meaningful_lift = np.mean((posterior_ad_samples - posterior_psa_samples) / posterior_psa_samples > min_lift)
-print(f"\n📈 Probability of >{min_lift*100:.0f}% relative lift:")
-print(f"   P(Lift > {min_lift*100:.0f}%): {prob_meaningful_lift:.6f} ({prob_meaningful_lift*100:.4f}%)")
+out.append(f"\n📊 Probability Estimates:")
+out.append(f"   P(Ad > PSA): {prob_ad_better:.6f} ({prob_ad_better*100:.4f}%)")
+out.append(f"   P(PSA > Ad): {prob_psa_better:.6f} ({prob_psa_better*100:.4f}%)")
+out.append(f"   P(Equal):    {prob_equal:.6f} ({prob_equal*100:.4f}%)")
+
+# Probability of meaningful lift (e.g., > 1% relative lift), sampled above
+out.append(f"\n📈 Probability of >{min_lift*100:.0f}% relative lift:")
+out.append(f"   P(Lift > {min_lift*100:.0f}%): {prob_meaningful_lift:.6f} ({prob_meaningful_lift*100:.4f}%)")
 
 # Interpretation
 if prob_ad_better > 0.95:
@@ -206,16 +248,18 @@ else:
     interpretation = "No Evidence"
     symbol = "❌"
 
-print(f"\n{symbol} Interpretation:")
-print(f"   {interpretation} that Ad group is superior")
+out.append(f"\n{symbol} Interpretation:")
+out.append(f"   {interpretation} that Ad group is superior")
+
+flush_output()
 
 # ============================================================================
 # 6. EXPECTED VALUE CALCULATIONS
 # ============================================================================
 
-print("\n" + "="*80)
-print("EXPECTED VALUE CALCULATIONS")
-print("="*80)
+out.append("\n" + "="*80)
+out.append("EXPECTED VALUE CALCULATIONS")
+out.append("="*80)
 
 # Assume a value per conversion (e.g., $100)
 value_per_conversion = 100
@@ -226,61 +270,64 @@ expected_incremental_conversions = (post_mean_ad - post_mean_psa) * n_ad
 # Expected incremental revenue
 expected_incremental_revenue = expected_incremental_conversions * value_per_conversion
 
-print(f"\n📊 Expected Business Impact (assuming ${value_per_conversion} per conversion):")
-print(f"   Expected incremental conversion rate: {post_mean_ad - post_mean_psa:.6f}")
-print(f"   Expected incremental conversions: {expected_incremental_conversions:.2f}")
-print(f"   Expected incremental revenue: ${expected_incremental_revenue:,.2f}")
+out.append(f"\n📊 Expected Business Impact (assuming ${value_per_conversion} per conversion):")
+out.append(f"   Expected incremental conversion rate: {post_mean_ad - post_mean_psa:.6f}")
+out.append(f"   Expected incremental conversions: {expected_incremental_conversions:.2f}")
+out.append(f"   Expected incremental revenue: ${expected_incremental_revenue:,.2f}")
 
 # Distribution of expected revenue
-revenue_samples = (posterior_ad_samples - posterior_psa_samples) * n_ad * value_per_conversion
-revenue_ci_lower = np.percentile(revenue_samples, 2.5)
-revenue_ci_upper = np.percentile(revenue_samples, 97.5)
+# Revenue is a positive linear scaling of the difference, so its quantiles
+# are the scaled difference quantiles
+revenue_per_unit_diff = n_ad * value_per_conversion
+revenue_ci_lower = diff_ci_lower * revenue_per_unit_diff
+revenue_ci_upper = diff_ci_upper * revenue_per_unit_diff
 
-print(f"\n📈 Revenue Distribution:")
-print(f"   Mean: ${revenue_samples.mean():,.2f}")
-print(f"   95% Credible Interval: [${revenue_ci_lower:,.2f}, ${revenue_ci_upper:,.2f}]")
+out.append(f"\n📈 Revenue Distribution:")
+out.append(f"   Mean: ${diff_mean * revenue_per_unit_diff:,.2f}")
+out.append(f"   95% Credible Interval: [${revenue_ci_lower:,.2f}, ${revenue_ci_upper:,.2f}]")
+
+flush_output()
 
 # ============================================================================
 # 7. POSTERIOR PREDICTIVE DISTRIBUTION
 # ============================================================================
 
-print("\n" + "="*80)
-print("POSTERIOR PREDICTIVE DISTRIBUTION")
-print("="*80)
+out.append("\n" + "="*80)
+out.append("POSTERIOR PREDICTIVE DISTRIBUTION")
+out.append("="*80)
 
 # For future users, what's the predicted conversion rate?
 # Sample from posterior, then sample from binomial
 future_n = 10000
-posterior_predictive_samples = []
-
-for _ in range(1000):
-    # Sample conversion rate from posterior
-    p_ad = np.random.beta(alpha_post_ad, beta_post_ad)
-    p_psa = np.random.beta(alpha_post_psa, beta_post_psa)
-    # Sample future conversions
-    future_ad = np.random.binomial(future_n, p_ad)
-    future_psa = np.random.binomial(future_n, p_psa)
-    posterior_predictive_samples.append({
-        'ad_rate': future_ad / future_n,
-        'psa_rate': future_psa / future_n,
-        'lift': (future_ad / future_n - future_psa / future_n) / (future_psa / future_n)
-    })
-
-predictive_df = pd.DataFrame(posterior_predictive_samples)
-
-print(f"\n📊 Predicted Performance for {future_n:,} future users:")
-print(f"   Expected Ad conversion rate: {predictive_df['ad_rate'].mean():.6f}")
-print(f"   Expected PSA conversion rate: {predictive_df['psa_rate'].mean():.6f}")
-print(f"   Expected lift: {predictive_df['lift'].mean()*100:.4f}%")
-print(f"   95% CI for lift: [{predictive_df['lift'].quantile(0.025)*100:.4f}%, {predictive_df['lift'].quantile(0.975)*100:.4f}%]")
+n_predictive = 1000
+
+# Sample conversion rates from the posteriors, then future conversions
+# (binomial broadcasts over the array of sampled rates)
+p_ad = rng.beta(alpha_post_ad, beta_post_ad, size=n_predictive)
+p_psa = rng.beta(alpha_post_psa, beta_post_psa, size=n_predictive)
+future_ad = rng.binomial(future_n, p_ad)
+future_psa = rng.binomial(future_n, p_psa)
+
+predictive_ad_rate = future_ad / future_n
+predictive_psa_rate = future_psa / future_n
+predictive_lift = (predictive_ad_rate - predictive_psa_rate) / predictive_psa_rate
+lift_ci_lower, lift_ci_upper = np.quantile(predictive_lift, [0.025, 0.975])
+
+out.append(f"\n📊 Predicted Performance for {future_n:,} future users:")
+out.append(f"   Expected Ad conversion rate: {predictive_ad_rate.mean():.6f}")
+out.append(f"   Expected PSA conversion rate: {predictive_psa_rate.mean():.6f}")
+out.append(f"   Expected lift: {predictive_lift.mean()*100:.4f}%")
+out.append(f"   95% CI for lift: [{lift_ci_lower*100:.4f}%, {lift_ci_upper*100:.4f}%]")
+
+flush_output()
 
 # ============================================================================
 # 8. SUMMARY STATISTICS
 # ============================================================================
 
-print("\n" + "="*80)
-print("SUMMARY STATISTICS")
-print("="*80)
+out.append("\n" + "="*80)
+out.append("SUMMARY STATISTICS")
+out.append("="*80)
 
 summary = {
     'ad_group_size': n_ad,
@@ -302,22 +349,36 @@ summary = {
     'revenue_ci_upper': revenue_ci_upper
 }
 
-print("\n📋 Key Metrics:")
+out.append("\n📋 Key Metrics:")
 for key, value in summary.items():
     if isinstance(value, float):
-        print(f"   {key}: {value:.6f}")
+        out.append(f"   {key}: {value:.6f}")
     else:
-        print(f"   {key}: {value}")
+        out.append(f"   {key}: {value}")
+
+flush_output()
+
+def _np_default(o):
+    """JSON fallback for NumPy scalars and arrays"""
+    if isinstance(o, np.bool_):
+        return bool(o)
+    if isinstance(o, np.integer):
+        return int(o)
+    if isinstance(o, np.floating):
+        return float(o)
+    if isinstance(o, np.ndarray):
+        return o.tolist()
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
 
 # Save summary
 import json
 with open('bayesian_results.json', 'w') as f:
-    json.dump({k: float(v) if isinstance(v, (np.integer, np.floating)) else v 
-              for k, v in summary.items()}, f, indent=2)
+    json.dump(summary, f, indent=2, default=_np_default)
 
-print("\n💾 Results saved to 'bayesian_results.json'")
+out.append("\n💾 Results saved to 'bayesian_results.json'")
 
-print("\n" + "="*80)
-print("BAYESIAN ANALYSIS COMPLETE ✓")
-print("="*80)
+out.append("\n" + "="*80)
+out.append("BAYESIAN ANALYSIS COMPLETE ✓")
+out.append("="*80)
 
+flush_output()
@@ -11,41 +11,53 @@ This notebook calculates business metrics including:
 
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
 import json
+import os
+from functools import lru_cache
 import warnings
+import sys
 warnings.filterwarnings('ignore')
 
-# Set style
-plt.style.use('seaborn-v0_8-darkgrid')
-sns.set_palette("husl")
+# Report lines are buffered per section and written to stdout in one call
+out = []
+
+def flush_output():
+    """Write the buffered report lines to stdout and clear the buffer"""
+    sys.stdout.write('\n'.join(out) + '\n')
+    out.clear()
 
 # ============================================================================
 # 1. DATA LOADING & ASSUMPTIONS
 # ============================================================================
 
-print("="*80)
-print("MARKETING A/B TEST - BUSINESS IMPACT ANALYSIS")
-print("="*80)
+out.append("="*80)
+out.append("MARKETING A/B TEST - BUSINESS IMPACT ANALYSIS")
+out.append("="*80)
+
+# Load data (typed Parquet copy written by ab_test_prepare_data.py)
+df = pd.read_parquet('marketing_AB.parquet', columns=['test group', 'converted', 'total ads'])
+
+@lru_cache(maxsize=4)
+def _read_json(path, mtime):
+    """Read a JSON file; cached on (path, mtime) so unchanged files are read once"""
+    with open(path, 'r') as f:
+        return json.load(f)
 
-# Load data
-df = pd.read_csv('marketing_AB.csv')
+def load_results(path):
+    """Load a JSON results file, or return None if it does not exist"""
+    try:
+        return _read_json(path, os.path.getmtime(path))
+    except FileNotFoundError:
+        return None
 
 # Load statistical results if available
-try:
-    with open('frequentist_results.json', 'r') as f:
-        frequentist_results = json.load(f)
-except FileNotFoundError:
-    print("⚠️  Frequentist results not found. Calculating from data...")
-    frequentist_results = None
-
-try:
-    with open('bayesian_results.json', 'r') as f:
-        bayesian_results = json.load(f)
-except FileNotFoundError:
-    print("⚠️  Bayesian results not found. Calculating from data...")
-    bayesian_results = None
+frequentist_results = load_results('frequentist_results.json')
+if frequentist_results is None:
+    out.append("⚠️  Frequentist results not found. Calculating from data...")
+
+bayesian_results = load_results('bayesian_results.json')
+if bayesian_results is None:
+    out.append("⚠️  Bayesian results not found. Calculating from data...")
 
 # Business assumptions (can be customized)
 ASSUMPTIONS = {
@@ -56,36 +68,45 @@ ASSUMPTIONS = {
     'marginal_cost_per_conversion': 0,  # Additional cost beyond ad spend
 }
 
+# Per-group users, conversions and ad impressions, counted with bincount
+# over the group codes
+group_codes = df['test group'].cat.codes.to_numpy()
+group_labels = df['test group'].cat.categories
+group_totals = pd.DataFrame({
+    'n': np.bincount(group_codes, minlength=len(group_labels)),
+    'conv': np.bincount(group_codes, weights=df['converted'].to_numpy(np.int8),
+                        minlength=len(group_labels)).astype(np.int64),
+    'ads': np.bincount(group_codes, weights=df['total ads'].to_numpy(),
+                       minlength=len(group_labels)).astype(np.int64)
+}, index=group_labels)
+
 # Calculate from data if not provided
 if ASSUMPTIONS['ad_group_total_ads'] is None:
-    ad_group = df[df['test group'] == 'ad']
-    ASSUMPTIONS['ad_group_total_ads'] = ad_group['total ads'].sum()
+    ASSUMPTIONS['ad_group_total_ads'] = group_totals.loc['ad', 'ads']
 
-print(f"\n📊 Business Assumptions:")
+out.append(f"\n📊 Business Assumptions:")
 for key, value in ASSUMPTIONS.items():
     if value is not None:
         if isinstance(value, float):
-            print(f"   {key}: ${value:,.2f}" if 'cost' in key or 'value' in key else f"   {key}: {value:,.2f}")
+            out.append(f"   {key}: ${value:,.2f}" if 'cost' in key or 'value' in key else f"   {key}: {value:,.2f}")
         else:
-            print(f"   {key}: {value:,}")
+            out.append(f"   {key}: {value:,}")
+
+flush_output()
 
 # ============================================================================
 # 2. CONVERSION METRICS
 # ============================================================================
 
-print("\n" + "="*80)
-print("CONVERSION METRICS")
-print("="*80)
-
-# Separate groups
-ad_group = df[df['test group'] == 'ad']
-psa_group = df[df['test group'] == 'psa']
+out.append("\n" + "="*80)
+out.append("CONVERSION METRICS")
+out.append("="*80)
 
 # Basic metrics
-n_ad = len(ad_group)
-n_psa = len(psa_group)
-ad_conversions = ad_group['converted'].sum()
-psa_conversions = psa_group['converted'].sum()
+n_ad = group_totals.loc['ad', 'n']
+n_psa = group_totals.loc['psa', 'n']
+ad_conversions = group_totals.loc['ad', 'conv']
+psa_conversions = group_totals.loc['psa', 'conv']
 
 cr_ad = ad_conversions / n_ad
 cr_psa = psa_conversions / n_psa
@@ -94,26 +115,28 @@ cr_psa = psa_conversions / n_psa
 incremental_conversions = ad_conversions - (n_ad * cr_psa)
 incremental_conversion_rate = cr_ad - cr_psa
 
-print(f"\n📊 Conversion Metrics:")
-print(f"   Ad Group:")
-print(f"      Users: {n_ad:,}")
-print(f"      Conversions: {ad_conversions:,}")
-print(f"      Conversion Rate: {cr_ad:.4%}")
-print(f"   PSA Group (Control):")
-print(f"      Users: {n_psa:,}")
-print(f"      Conversions: {psa_conversions:,}")
-print(f"      Conversion Rate: {cr_psa:.4%}")
-print(f"\n📈 Incremental Impact:")
-print(f"   Incremental Conversion Rate: {incremental_conversion_rate:.6f} ({incremental_conversion_rate*100:.4f}%)")
-print(f"   Incremental Conversions: {incremental_conversions:,.2f}")
+out.append(f"\n📊 Conversion Metrics:")
+out.append(f"   Ad Group:")
+out.append(f"      Users: {n_ad:,}")
+out.append(f"      Conversions: {ad_conversions:,}")
+out.append(f"      Conversion Rate: {cr_ad:.4%}")
+out.append(f"   PSA Group (Control):")
+out.append(f"      Users: {n_psa:,}")
+out.append(f"      Conversions: {psa_conversions:,}")
+out.append(f"      Conversion Rate: {cr_psa:.4%}")
+out.append(f"\n📈 Incremental Impact:")
+out.append(f"   Incremental Conversion Rate: {incremental_conversion_rate:.6f} ({incremental_conversion_rate*100:.4f}%)")
+out.append(f"   Incremental Conversions: {incremental_conversions:,.2f}")
+
+flush_output()
 
 # ============================================================================
 # 3. REVENUE ATTRIBUTION
 # ============================================================================
 
-print("\n" + "="*80)
-print("REVENUE ATTRIBUTION")
-print("="*80)
+out.append("\n" + "="*80)
+out.append("REVENUE ATTRIBUTION")
+out.append("="*80)
 
 value_per_conversion = ASSUMPTIONS['value_per_conversion']
 
@@ -134,20 +157,22 @@ else:
     revenue_ci_lower = incremental_revenue * 0.8
     revenue_ci_upper = incremental_revenue * 1.2
 
-print(f"\n📊 Revenue Metrics (${value_per_conversion} per conversion):")
-print(f"   Ad Group Total Revenue: ${total_revenue_ad:,.2f}")
-print(f"   PSA Group Total Revenue: ${total_revenue_psa:,.2f}")
-print(f"   Incremental Revenue: ${incremental_revenue:,.2f}")
-print(f"   Expected Incremental Revenue: ${expected_incremental_revenue:,.2f}")
-print(f"   95% CI: [${revenue_ci_lower:,.2f}, ${revenue_ci_upper:,.2f}]")
+out.append(f"\n📊 Revenue Metrics (${value_per_conversion} per conversion):")
+out.append(f"   Ad Group Total Revenue: ${total_revenue_ad:,.2f}")
+out.append(f"   PSA Group Total Revenue: ${total_revenue_psa:,.2f}")
+out.append(f"   Incremental Revenue: ${incremental_revenue:,.2f}")
+out.append(f"   Expected Incremental Revenue: ${expected_incremental_revenue:,.2f}")
+out.append(f"   95% CI: [${revenue_ci_lower:,.2f}, ${revenue_ci_upper:,.2f}]")
+
+flush_output()
 
 # ============================================================================
 # 4. COST ANALYSIS
 # ============================================================================
 
-print("\n" + "="*80)
-print("COST ANALYSIS")
-print("="*80)
+out.append("\n" + "="*80)
+out.append("COST ANALYSIS")
+out.append("="*80)
 
 # Calculate campaign costs
 cost_per_impression = ASSUMPTIONS['cost_per_ad_impression']
@@ -160,20 +185,22 @@ cost_per_conversion_ad = total_campaign_cost / ad_conversions if ad_conversions
 # Cost per incremental acquisition (CPA)
 cost_per_incremental_acquisition = total_campaign_cost / incremental_conversions if incremental_conversions > 0 else float('inf')
 
-print(f"\n📊 Cost Metrics:")
-print(f"   Total Ad Impressions: {total_ad_impressions:,}")
-print(f"   Cost per Impression: ${cost_per_impression:.4f}")
-print(f"   Total Campaign Cost: ${total_campaign_cost:,.2f}")
-print(f"   Cost per Conversion (Ad Group): ${cost_per_conversion_ad:.2f}")
-print(f"   Cost per Incremental Acquisition (CPA): ${cost_per_incremental_acquisition:.2f}")
+out.append(f"\n📊 Cost Metrics:")
+out.append(f"   Total Ad Impressions: {total_ad_impressions:,}")
+out.append(f"   Cost per Impression: ${cost_per_impression:.4f}")
+out.append(f"   Total Campaign Cost: ${total_campaign_cost:,.2f}")
+out.append(f"   Cost per Conversion (Ad Group): ${cost_per_conversion_ad:.2f}")
+out.append(f"   Cost per Incremental Acquisition (CPA): ${cost_per_incremental_acquisition:.2f}")
+
+flush_output()
 
 # ============================================================================
 # 5. RETURN ON AD SPEND (ROAS)
 # ============================================================================
 
-print("\n" + "="*80)
-print("RETURN ON AD SPEND (ROAS)")
-print("="*80)
+out.append("\n" + "="*80)
+out.append("RETURN ON AD SPEND (ROAS)")
+out.append("="*80)
 
 # ROAS = Revenue / Ad Spend
 roas_total = total_revenue_ad / total_campaign_cost if total_campaign_cost > 0 else float('inf')
@@ -183,31 +210,33 @@ roas_incremental = incremental_revenue / total_campaign_cost if total_campaign_c
 roi_total = (total_revenue_ad - total_campaign_cost) / total_campaign_cost if total_campaign_cost > 0 else float('inf')
 roi_incremental = (incremental_revenue - total_campaign_cost) / total_campaign_cost if total_campaign_cost > 0 else float('inf')
 
-print(f"\n📊 ROAS Metrics:")
-print(f"   ROAS (Total Revenue): {roas_total:.2f}x")
-print(f"      For every $1 spent, generated ${roas_total:.2f} in revenue")
-print(f"   ROAS (Incremental Revenue): {roas_incremental:.2f}x")
-print(f"      For every $1 spent, generated ${roas_incremental:.2f} in incremental revenue")
+out.append(f"\n📊 ROAS Metrics:")
+out.append(f"   ROAS (Total Revenue): {roas_total:.2f}x")
+out.append(f"      For every $1 spent, generated ${roas_total:.2f} in revenue")
+out.append(f"   ROAS (Incremental Revenue): {roas_incremental:.2f}x")
+out.append(f"      For every $1 spent, generated ${roas_incremental:.2f} in incremental revenue")
 
-print(f"\n📈 ROI Metrics:")
-print(f"   ROI (Total): {roi_total:.2%}")
-print(f"   ROI (Incremental): {roi_incremental:.2%}")
+out.append(f"\n📈 ROI Metrics:")
+out.append(f"   ROI (Total): {roi_total:.2%}")
+out.append(f"   ROI (Incremental): {roi_incremental:.2%}")
 
 # Interpretation
 if roas_incremental > 1:
-    print(f"\n✅ Campaign is profitable (ROAS > 1.0)")
+    out.append(f"\n✅ Campaign is profitable (ROAS > 1.0)")
 elif roas_incremental > 0.5:
-    print(f"\n⚠️  Campaign is marginally profitable")
+    out.append(f"\n⚠️  Campaign is marginally profitable")
 else:
-    print(f"\n❌ Campaign is not profitable (ROAS < 0.5)")
+    out.append(f"\n❌ Campaign is not profitable (ROAS < 0.5)")
+
+flush_output()
 
 # ============================================================================
 # 6. BREAK-EVEN ANALYSIS
 # ============================================================================
 
-print("\n" + "="*80)
-print("BREAK-EVEN ANALYSIS")
-print("="*80)
+out.append("\n" + "="*80)
+out.append("BREAK-EVEN ANALYSIS")
+out.append("="*80)
 
 # Break-even point: where incremental revenue = campaign cost
 # incremental_conversions * value_per_conversion = total_campaign_cost
@@ -219,80 +248,98 @@ break_even_conversion_rate = break_even_conversions / n_ad
 current_incremental = incremental_conversions
 conversion_rate_needed = break_even_conversion_rate
 
-print(f"\n📊 Break-Even Metrics:")
-print(f"   Break-Even Incremental Conversions: {break_even_conversions:,.2f}")
-print(f"   Current Incremental Conversions: {current_incremental:,.2f}")
-print(f"   Break-Even Conversion Rate Lift: {conversion_rate_needed:.6f} ({conversion_rate_needed*100:.4f}%)")
-print(f"   Current Conversion Rate Lift: {incremental_conversion_rate:.6f} ({incremental_conversion_rate*100:.4f}%)")
+out.append(f"\n📊 Break-Even Metrics:")
+out.append(f"   Break-Even Incremental Conversions: {break_even_conversions:,.2f}")
+out.append(f"   Current Incremental Conversions: {current_incremental:,.2f}")
+out.append(f"   Break-Even Conversion Rate Lift: {conversion_rate_needed:.6f} ({conversion_rate_needed*100:.4f}%)")
+out.append(f"   Current Conversion Rate Lift: {incremental_conversion_rate:.6f} ({incremental_conversion_rate*100:.4f}%)")
 
 if current_incremental > break_even_conversions:
     margin = current_incremental - break_even_conversions
-    print(f"\n✅ Campaign exceeds break-even by {margin:,.2f} conversions")
+    out.append(f"\n✅ Campaign exceeds break-even by {margin:,.2f} conversions")
 else:
     shortfall = break_even_conversions - current_incremental
-    print(f"\n⚠️  Campaign needs {shortfall:,.2f} more incremental conversions to break even")
+    out.append(f"\n⚠️  Campaign needs {shortfall:,.2f} more incremental conversions to break even")
+
+flush_output()
 
 # ============================================================================
 # 7. SCALING PROJECTIONS
 # ============================================================================
 
-print("\n" + "="*80)
-print("SCALING PROJECTIONS")
-print("="*80)
+out.append("\n" + "="*80)
+out.append("SCALING PROJECTIONS")
+out.append("="*80)
 
 # Projections for different user volumes
 scaling_scenarios = [10000, 50000, 100000, 500000, 1000000]
 
-print(f"\n📊 Projected Impact at Different Scales:")
-print(f"{'Users':>12} {'Incremental Conv.':>20} {'Incremental Revenue':>25} {'Campaign Cost':>20} {'ROAS':>10}")
-print("-" * 95)
-
-for n_users in scaling_scenarios:
-    projected_incremental = n_users * incremental_conversion_rate
-    projected_revenue = projected_incremental * value_per_conversion
-    # Assume same cost per impression, scale impressions proportionally
-    impressions_per_user = total_ad_impressions / n_ad
-    projected_impressions = n_users * impressions_per_user
-    projected_cost = projected_impressions * cost_per_impression
-    projected_roas = projected_revenue / projected_cost if projected_cost > 0 else float('inf')
-    
-    print(f"{n_users:>12,} {projected_incremental:>20,.0f} ${projected_revenue:>24,.2f} ${projected_cost:>19,.2f} {projected_roas:>10.2f}x")
+# Compute the whole projection table at once; the loop below only formats it
+users_arr = np.array(scaling_scenarios)
+projected_incremental = users_arr * incremental_conversion_rate
+projected_revenue = projected_incremental * value_per_conversion
+# Assume same cost per impression, scale impressions proportionally
+impressions_per_user = total_ad_impressions / n_ad
+projected_cost = users_arr * impressions_per_user * cost_per_impression
+projected_roas = np.divide(projected_revenue, projected_cost,
+                           out=np.full(len(users_arr), np.inf), where=projected_cost > 0)
+
+out.append(f"\n📊 Projected Impact at Different Scales:")
+out.append(f"{'Users':>12} {'Incremental Conv.':>20} {'Incremental Revenue':>25} {'Campaign Cost':>20} {'ROAS':>10}")
+out.append("-" * 95)
+
+for n_users, inc, rev, cost, roas in zip(users_arr, projected_incremental, projected_revenue,
+                                         projected_cost, projected_roas):
+    out.append(f"{n_users:>12,} {inc:>20,.0f} ${rev:>24,.2f} ${cost:>19,.2f} {roas:>10.2f}x")
+
+flush_output()
 
 # ============================================================================
 # 8. SENSITIVITY ANALYSIS
 # ============================================================================
 
-print("\n" + "="*80)
-print("SENSITIVITY ANALYSIS")
-print("="*80)
+out.append("\n" + "="*80)
+out.append("SENSITIVITY ANALYSIS")
+out.append("="*80)
 
 # Vary key assumptions
 value_scenarios = [50, 75, 100, 125, 150]
 cost_scenarios = [0.005, 0.01, 0.015, 0.02]
 
-print(f"\n📊 Sensitivity to Value per Conversion:")
-print(f"{'Value/Conv':>12} {'Incremental Revenue':>25} {'ROAS':>10}")
-print("-" * 50)
-for value in value_scenarios:
-    rev = incremental_conversions * value
-    roas = rev / total_campaign_cost if total_campaign_cost > 0 else float('inf')
-    print(f"${value:>11,.0f} ${rev:>24,.2f} {roas:>10.2f}x")
-
-print(f"\n📊 Sensitivity to Cost per Impression:")
-print(f"{'Cost/Imp':>12} {'Campaign Cost':>20} {'ROAS':>10}")
-print("-" * 45)
-for cost in cost_scenarios:
-    campaign_cost = total_ad_impressions * cost
-    roas = incremental_revenue / campaign_cost if campaign_cost > 0 else float('inf')
-    print(f"${cost:>11,.4f} ${campaign_cost:>19,.2f} {roas:>10.2f}x")
+# Scenario tables computed as arrays; the loops below only format them
+values_arr = np.array(value_scenarios)
+value_revs = incremental_conversions * values_arr
+if total_campaign_cost > 0:
+    value_roas = value_revs / total_campaign_cost
+else:
+    value_roas = np.full(len(values_arr), np.inf)
+
+costs_arr = np.array(cost_scenarios)
+campaign_costs = total_ad_impressions * costs_arr
+cost_roas = np.divide(incremental_revenue, campaign_costs,
+                      out=np.full(len(costs_arr), np.inf), where=campaign_costs > 0)
+
+out.append(f"\n📊 Sensitivity to Value per Conversion:")
+out.append(f"{'Value/Conv':>12} {'Incremental Revenue':>25} {'ROAS':>10}")
+out.append("-" * 50)
+for value, rev, roas in zip(values_arr, value_revs, value_roas):
+    out.append(f"${value:>11,.0f} ${rev:>24,.2f} {roas:>10.2f}x")
+
+out.append(f"\n📊 Sensitivity to Cost per Impression:")
+out.append(f"{'Cost/Imp':>12} {'Campaign Cost':>20} {'ROAS':>10}")
+out.append("-" * 45)
+for cost, campaign_cost, roas in zip(costs_arr, campaign_costs, cost_roas):
+    out.append(f"${cost:>11,.4f} ${campaign_cost:>19,.2f} {roas:>10.2f}x")
+
+flush_output()
 
 # ============================================================================
 # 9. SUMMARY STATISTICS
 # ============================================================================
 
-print("\n" + "="*80)
-print("SUMMARY STATISTICS")
-print("="*80)
+out.append("\n" + "="*80)
+out.append("SUMMARY STATISTICS")
+out.append("="*80)
 
 summary = {
     'ad_group_size': n_ad,
@@ -317,28 +364,42 @@ summary = {
     'is_profitable': roas_incremental > 1.0
 }
 
-print("\n📋 Key Business Metrics:")
+out.append("\n📋 Key Business Metrics:")
 for key, value in summary.items():
     if isinstance(value, float):
         if 'rate' in key or 'roi' in key:
-            print(f"   {key}: {value:.6f} ({value*100:.4f}%)")
+            out.append(f"   {key}: {value:.6f} ({value*100:.4f}%)")
         elif 'cost' in key or 'revenue' in key or 'value' in key:
-            print(f"   {key}: ${value:,.2f}")
+            out.append(f"   {key}: ${value:,.2f}")
         else:
-            print(f"   {key}: {value:.6f}")
+            out.append(f"   {key}: {value:.6f}")
     elif isinstance(value, bool):
-        print(f"   {key}: {'Yes' if value else 'No'}")
+        out.append(f"   {key}: {'Yes' if value else 'No'}")
     else:
-        print(f"   {key}: {value:,}")
+        out.append(f"   {key}: {value:,}")
+
+flush_output()
+
+def _np_default(o):
+    """JSON fallback for NumPy scalars and arrays"""
+    if isinstance(o, np.bool_):
+        return bool(o)
+    if isinstance(o, np.integer):
+        return int(o)
+    if isinstance(o, np.floating):
+        return float(o)
+    if isinstance(o, np.ndarray):
+        return o.tolist()
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
 
 # Save summary
 with open('business_impact_results.json', 'w') as f:
-    json.dump({k: float(v) if isinstance(v, (np.integer, np.floating)) else v 
-              for k, v in summary.items()}, f, indent=2)
+    json.dump(summary, f, indent=2, default=_np_default)
 
-print("\n💾 Results saved to 'business_impact_results.json'")
+out.append("\n💾 Results saved to 'business_impact_results.json'")
 
-print("\n" + "="*80)
-print("BUSINESS IMPACT ANALYSIS COMPLETE ✓")
-print("="*80)
+out.append("\n" + "="*80)
+out.append("BUSINESS IMPACT ANALYSIS COMPLETE ✓")
+out.append("="*80)
 
+flush_output()
@@ -6,304 +6,361 @@ This notebook performs comprehensive EDA on the marketing campaign data.
 
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
 from scipy import stats
 import warnings
+import sys
 warnings.filterwarnings('ignore')
 
-# Set style
-plt.style.use('seaborn-v0_8-darkgrid')
-sns.set_palette("husl")
+# Report lines are buffered per section and written to stdout in one call
+out = []
+
+def flush_output():
+    """Write the buffered report lines to stdout and clear the buffer"""
+    sys.stdout.write('\n'.join(out) + '\n')
+    out.clear()
 
 # ============================================================================
 # 1. DATA LOADING & INITIAL INSPECTION
 # ============================================================================
 
-print("="*80)
-print("MARKETING A/B TEST - EXPLORATORY DATA ANALYSIS")
-print("="*80)
+out.append("="*80)
+out.append("MARKETING A/B TEST - EXPLORATORY DATA ANALYSIS")
+out.append("="*80)
+
+# Load data (typed Parquet copy written by ab_test_prepare_data.py)
+df = pd.read_parquet('marketing_AB.parquet')
 
-# Load data (update path as needed)
-df = pd.read_csv('marketing_AB.csv')
+out.append("\n📊 Dataset Overview")
+out.append("-" * 80)
+out.append(f"Total Records: {len(df):,}")
+out.append(f"Features: {df.shape[1]}")
+out.append(f"\nColumns: {list(df.columns)}")
 
-print("\n📊 Dataset Overview")
-print("-" * 80)
-print(f"Total Records: {len(df):,}")
-print(f"Features: {df.shape[1]}")
-print(f"\nColumns: {list(df.columns)}")
+out.append("\n📋 First 5 Rows:")
+out.append(str(df.head()))
 
-print("\n📋 First 5 Rows:")
-print(df.head())
+out.append("\n🔍 Data Types:")
+out.append(str(df.dtypes))
 
-print("\n🔍 Data Types:")
-print(df.dtypes)
+out.append("\n📈 Statistical Summary:")
+out.append(str(df.describe()))
 
-print("\n📈 Statistical Summary:")
-print(df.describe())
+flush_output()
 
 # ============================================================================
 # 2. DATA QUALITY CHECKS
 # ============================================================================
 
-print("\n" + "="*80)
-print("DATA QUALITY ASSESSMENT")
-print("="*80)
+out.append("\n" + "="*80)
+out.append("DATA QUALITY ASSESSMENT")
+out.append("="*80)
 
 # Missing values
-print("\n🔍 Missing Values:")
+out.append("\n🔍 Missing Values:")
 missing = df.isnull().sum()
 missing_pct = 100 * missing / len(df)
 missing_df = pd.DataFrame({
     'Missing Count': missing,
     'Percentage': missing_pct
 })
-print(missing_df[missing_df['Missing Count'] > 0])
+out.append(str(missing_df[missing_df['Missing Count'] > 0]))
 
 if missing.sum() == 0:
-    print("✅ No missing values detected!")
+    out.append("✅ No missing values detected!")
 
 # Duplicates
 duplicates = df.duplicated().sum()
-print(f"\n🔍 Duplicate Rows: {duplicates}")
+out.append(f"\n🔍 Duplicate Rows: {duplicates}")
 if duplicates == 0:
-    print("✅ No duplicates detected!")
+    out.append("✅ No duplicates detected!")
 
 # Unique users
-print(f"\n🔍 Unique Users: {df['user id'].nunique():,}")
-print(f"Total Records: {len(df):,}")
+out.append(f"\n🔍 Unique Users: {df['user id'].nunique():,}")
+out.append(f"Total Records: {len(df):,}")
 if df['user id'].nunique() == len(df):
-    print("✅ Each row represents a unique user!")
+    out.append("✅ Each row represents a unique user!")
+
+flush_output()
 
 # ============================================================================
 # 3. GROUP DISTRIBUTION ANALYSIS
 # ============================================================================
 
-print("\n" + "="*80)
-print("TEST GROUP DISTRIBUTION")
-print("="*80)
+out.append("\n" + "="*80)
+out.append("TEST GROUP DISTRIBUTION")
+out.append("="*80)
 
 group_dist = df['test group'].value_counts()
 group_pct = 100 * group_dist / len(df)
 
-print("\n📊 Group Sizes:")
+out.append("\n📊 Group Sizes:")
 for group, count in group_dist.items():
     pct = 100 * count / len(df)
-    print(f"  {group.upper():8s}: {count:,} ({pct:.1f}%)")
+    out.append(f"  {group.upper():8s}: {count:,} ({pct:.1f}%)")
 
 # Test for balanced randomization
-print("\n🧪 Randomization Check:")
+out.append("\n🧪 Randomization Check:")
 expected_ratio = 0.5
 ad_ratio = group_dist['ad'] / len(df)
 if 0.45 <= ad_ratio <= 0.55:
-    print("✅ Groups are reasonably balanced (45-55% split)")
+    out.append("✅ Groups are reasonably balanced (45-55% split)")
 else:
-    print(f"⚠️  Warning: Unbalanced split ({ad_ratio:.1%} in ad group)")
+    out.append(f"⚠️  Warning: Unbalanced split ({ad_ratio:.1%} in ad group)")
+
+flush_output()
 
 # ============================================================================
 # 4. CONVERSION ANALYSIS
 # ============================================================================
 
-print("\n" + "="*80)
-print("CONVERSION RATE ANALYSIS")
-print("="*80)
+out.append("\n" + "="*80)
+out.append("CONVERSION RATE ANALYSIS")
+out.append("="*80)
 
 # Overall conversion
 overall_cr = df['converted'].mean()
-print(f"\n📈 Overall Conversion Rate: {overall_cr:.2%}")
+out.append(f"\n📈 Overall Conversion Rate: {overall_cr:.2%}")
+
+# Per-group conversion and ad exposure statistics in a single pass
+group_stats = df.groupby('test group', observed=True).agg(
+    Users=('converted', 'size'),
+    Conversions=('converted', 'sum'),
+    Conversion_Rate=('converted', 'mean'),
+    Mean_Ads=('total ads', 'mean'),
+    Std_Ads=('total ads', 'std')
+)
 
 # By group
-print("\n📊 Conversion Rate by Group:")
-conversion_by_group = df.groupby('test group')['converted'].agg([
-    ('Users', 'count'),
-    ('Conversions', 'sum'),
-    ('Conversion_Rate', 'mean')
-])
+out.append("\n📊 Conversion Rate by Group:")
+conversion_by_group = group_stats[['Users', 'Conversions', 'Conversion_Rate']].copy()
 conversion_by_group['Conversion_Rate'] = conversion_by_group['Conversion_Rate'] * 100
-print(conversion_by_group)
+out.append(str(conversion_by_group))
 
-# Calculate lift
-cr_ad = df[df['test group'] == 'ad']['converted'].mean()
-cr_psa = df[df['test group'] == 'psa']['converted'].mean()
+# Calculate lift (from the per-group counts above, no extra pass over df)
+cr_ad = conversion_by_group.loc['ad', 'Conversions'] / conversion_by_group.loc['ad', 'Users']
+cr_psa = conversion_by_group.loc['psa', 'Conversions'] / conversion_by_group.loc['psa', 'Users']
 lift = (cr_ad - cr_psa) / cr_psa * 100
 
-print(f"\n📈 Conversion Lift (Ad vs PSA): {lift:+.2f}%")
-print(f"   Ad Group:  {cr_ad:.4f} ({cr_ad*100:.2f}%)")
-print(f"   PSA Group: {cr_psa:.4f} ({cr_psa*100:.2f}%)")
+out.append(f"\n📈 Conversion Lift (Ad vs PSA): {lift:+.2f}%")
+out.append(f"   Ad Group:  {cr_ad:.4f} ({cr_ad*100:.2f}%)")
+out.append(f"   PSA Group: {cr_psa:.4f} ({cr_psa*100:.2f}%)")
+
+flush_output()
 
 # ============================================================================
 # 5. AD EXPOSURE ANALYSIS
 # ============================================================================
 
-print("\n" + "="*80)
-print("AD EXPOSURE PATTERNS")
-print("="*80)
+out.append("\n" + "="*80)
+out.append("AD EXPOSURE PATTERNS")
+out.append("="*80)
 
-print("\n📊 Total Ads Statistics:")
-print(df['total ads'].describe())
+out.append("\n📊 Total Ads Statistics:")
+out.append(str(df['total ads'].describe()))
 
-print("\n📈 Ad Exposure by Group:")
-ad_exposure = df.groupby('test group')['total ads'].describe()
-print(ad_exposure)
+out.append("\n📈 Ad Exposure by Group:")
+ad_exposure = group_stats[['Mean_Ads', 'Std_Ads']]
+out.append(str(ad_exposure))
 
 # Correlation between ads and conversion (for ad group only)
-ad_group = df[df['test group'] == 'ad']
-correlation = ad_group['total ads'].corr(ad_group['converted'])
-print(f"\n🔗 Correlation (Total Ads vs Conversion): {correlation:.4f}")
+ad_mask = (df['test group'] == 'ad').to_numpy()
+ad_total = df['total ads'].to_numpy(np.int32)[ad_mask]
+ad_conv = df['converted'].to_numpy(np.int8)[ad_mask]
+# Pearson r from integer sums; converted is 0/1 so sum(y^2) == sum(y).
+# Widen to int64 before multiplying and keep the sums as Python ints so
+# neither the products nor the n * sum terms can overflow.
+n_ad = len(ad_total)
+ad_total64 = ad_total.astype(np.int64)
+sx = int(ad_total64.sum())
+sy = int(ad_conv.sum(dtype=np.int64))
+sxy = int(ad_total64 @ ad_conv)
+sxx = int(ad_total64 @ ad_total64)
+correlation = (n_ad * sxy - sx * sy) / np.sqrt(float(n_ad * sxx - sx * sx) * float(n_ad * sy - sy * sy))
+out.append(f"\n🔗 Correlation (Total Ads vs Conversion): {correlation:.4f}")
+
+flush_output()
 
 # ============================================================================
 # 5.5. DOSE-RESPONSE ANALYSIS
 # ============================================================================
 
-print("\n" + "="*80)
-print("DOSE-RESPONSE ANALYSIS - AD EXPOSURE IMPACT")
-print("="*80)
+out.append("\n" + "="*80)
+out.append("DOSE-RESPONSE ANALYSIS - AD EXPOSURE IMPACT")
+out.append("="*80)
 
-# Create ad exposure bins
-ad_group['ad_bins'] = pd.cut(ad_group['total ads'], bins=10, labels=False)
-ad_group['ad_bins_mid'] = ad_group.groupby('ad_bins')['total ads'].transform('mean')
+# Create ad exposure bins: 10 equal-width, right-closed bins over the
+# observed range (the same bins as pd.cut(..., bins=10))
+ad_bin_edges = np.linspace(ad_total.min(), ad_total.max(), 11)
+ad_bins = np.digitize(ad_total, ad_bin_edges[1:-1], right=True)
 
 # Conversion rate by ad exposure level
-print("\n📊 Conversion Rate by Ad Exposure Level:")
-dose_response = ad_group.groupby('ad_bins').agg({
+out.append("\n📊 Conversion Rate by Ad Exposure Level:")
+dose_response = pd.DataFrame(
+    {'total ads': ad_total, 'converted': ad_conv, 'ad_bins': ad_bins}
+).groupby('ad_bins').agg({
     'total ads': ['min', 'max', 'mean', 'count'],
     'converted': ['sum', 'mean']
 }).round(4)
 dose_response.columns = ['Min_Ads', 'Max_Ads', 'Mean_Ads', 'Users', 'Conversions', 'Conversion_Rate']
 dose_response['Conversion_Rate'] = dose_response['Conversion_Rate'] * 100
-dose_response = dose_response.sort_values('Mean_Ads')
-print(dose_response)
+out.append(str(dose_response))
 
 # Statistical test for dose-response relationship
-from scipy.stats import spearmanr, pearsonr
+from scipy.stats import pearsonr
+
+def fast_rank(x):
+    """Average ranks of x (same as rankdata) from a single stable argsort"""
+    order = np.argsort(x, kind='stable')
+    x_sorted = x[order]
+    # Runs of equal values share the mean of the 1-based positions they span
+    bounds = np.concatenate(([0], np.flatnonzero(x_sorted[1:] != x_sorted[:-1]) + 1, [len(x)]))
+    ranks = np.empty(len(x))
+    ranks[order] = np.repeat((bounds[:-1] + bounds[1:] + 1) / 2, np.diff(bounds))
+    return ranks
 
 # Spearman correlation (non-parametric, handles non-linear relationships)
-spearman_corr, spearman_p = spearmanr(ad_group['total ads'], ad_group['converted'])
-pearson_corr, pearson_p = pearsonr(ad_group['total ads'], ad_group['converted'])
+# Ranking the 0/1 conversion column only maps it affinely, so Spearman is
+# the Pearson correlation between the ranks of total ads and conversion.
+spearman_corr = np.corrcoef(fast_rank(ad_total), ad_conv)[0, 1]
+spearman_t = spearman_corr * np.sqrt((n_ad - 2) / (1 - spearman_corr**2))
+spearman_p = 2 * stats.t.sf(abs(spearman_t), n_ad - 2)
+pearson_corr, pearson_p = pearsonr(ad_total, ad_conv)
 
-print(f"\n📈 Dose-Response Statistical Tests:")
-print(f"   Spearman Correlation: {spearman_corr:.4f} (p-value: {spearman_p:.6f})")
-print(f"   Pearson Correlation: {pearson_corr:.4f} (p-value: {pearson_p:.6f})")
+out.append(f"\n📈 Dose-Response Statistical Tests:")
+out.append(f"   Spearman Correlation: {spearman_corr:.4f} (p-value: {spearman_p:.6f})")
+out.append(f"   Pearson Correlation: {pearson_corr:.4f} (p-value: {pearson_p:.6f})")
 
 if spearman_p < 0.05:
-    print(f"   ✅ Significant dose-response relationship detected")
+    out.append(f"   ✅ Significant dose-response relationship detected")
 else:
-    print(f"   ⚠️  No significant dose-response relationship")
+    out.append(f"   ⚠️  No significant dose-response relationship")
 
 # Optimal ad exposure analysis
-print(f"\n📊 Optimal Ad Exposure Analysis:")
-optimal_exposure = dose_response.loc[dose_response['Conversion_Rate'].idxmax()]
-print(f"   Optimal exposure range: {optimal_exposure['Min_Ads']:.0f} - {optimal_exposure['Max_Ads']:.0f} ads")
-print(f"   Optimal conversion rate: {optimal_exposure['Conversion_Rate']:.4f}%")
-print(f"   Users in optimal range: {optimal_exposure['Users']:.0f}")
+out.append(f"\n📊 Optimal Ad Exposure Analysis:")
+# Groupby keys are bin numbers, so rows are already in exposure order
+cr_arr = dose_response['Conversion_Rate'].to_numpy()
+peak = cr_arr.argmax()
+optimal_exposure = dose_response.iloc[peak]
+out.append(f"   Optimal exposure range: {optimal_exposure['Min_Ads']:.0f} - {optimal_exposure['Max_Ads']:.0f} ads")
+out.append(f"   Optimal conversion rate: {optimal_exposure['Conversion_Rate']:.4f}%")
+out.append(f"   Users in optimal range: {optimal_exposure['Users']:.0f}")
 
 # Diminishing returns analysis
-print(f"\n📉 Diminishing Returns Analysis:")
+out.append(f"\n📉 Diminishing Returns Analysis:")
 if len(dose_response) > 2:
     # Check if conversion rate decreases after a certain point
-    max_idx = dose_response['Conversion_Rate'].idxmax()
-    after_max = dose_response.loc[dose_response.index > max_idx]
+    after_max = cr_arr[peak + 1:]
     if len(after_max) > 0:
-        avg_after_max = after_max['Conversion_Rate'].mean()
+        avg_after_max = after_max.mean()
         if avg_after_max < optimal_exposure['Conversion_Rate']:
-            print(f"   ⚠️  Evidence of diminishing returns after {optimal_exposure['Max_Ads']:.0f} ads")
-            print(f"   Average conversion rate after peak: {avg_after_max:.4f}%")
+            out.append(f"   ⚠️  Evidence of diminishing returns after {optimal_exposure['Max_Ads']:.0f} ads")
+            out.append(f"   Average conversion rate after peak: {avg_after_max:.4f}%")
         else:
-            print(f"   ✅ No clear diminishing returns detected")
+            out.append(f"   ✅ No clear diminishing returns detected")
+
+flush_output()
 
 # ============================================================================
 # 6. TEMPORAL PATTERNS - DETAILED ANALYSIS
 # ============================================================================
 
-print("\n" + "="*80)
-print("TEMPORAL PATTERNS - DETAILED ANALYSIS")
-print("="*80)
+out.append("\n" + "="*80)
+out.append("TEMPORAL PATTERNS - DETAILED ANALYSIS")
+out.append("="*80)
 
-print("\n📅 Most Ads Day Distribution:")
-day_dist = df['most ads day'].value_counts().sort_index()
-print(day_dist)
+out.append("\n📅 Most Ads Day Distribution:")
+# Counting sorts over the category codes / hours; both come out in index order
+day_codes = df['most ads day'].cat.codes.to_numpy()
+day_labels = df['most ads day'].cat.categories
+day_dist = pd.Series(np.bincount(day_codes, minlength=len(day_labels)),
+                     index=pd.Index(day_labels, name='most ads day'), name='count')
+out.append(str(day_dist))
 
-print("\n⏰ Most Ads Hour Distribution:")
-hour_dist = df['most ads hour'].value_counts().sort_index()
-print(hour_dist.head(10))
+out.append("\n⏰ Most Ads Hour Distribution:")
+hour_counts = np.bincount(df['most ads hour'].to_numpy(np.int8), minlength=24)
+hour_dist = pd.Series(hour_counts, index=pd.RangeIndex(len(hour_counts), name='most ads hour'),
+                      name='count')
+out.append(str(hour_dist.head(10)))
 
 # Peak hours
-peak_hours = hour_dist.nlargest(5)
-print(f"\n🔝 Top 5 Peak Hours:")
+# Stable sort of the 24 counts keeps nlargest's tie order (earlier hour first)
+peak_hours = hour_dist.iloc[np.argsort(-hour_counts, kind='stable')[:5]]
+out.append(f"\n🔝 Top 5 Peak Hours:")
 for hour, count in peak_hours.items():
-    print(f"   Hour {hour}: {count:,} users")
+    out.append(f"   Hour {hour}: {count:,} users")
+
+# Users and conversions for the finest grouping, computed in one pass;
+# every temporal table below is a small rollup of it
+temporal_base = df.groupby(
+    ['test group', 'most ads day', 'most ads hour'], sort=False, observed=True
+)['converted'].agg(['count', 'sum'])
+temporal_base.columns = ['Users', 'Conversions']
+
+def conversion_rollup(level):
+    """Roll temporal_base up to the given index level(s) and add Conversion_Rate (%)"""
+    table = temporal_base.groupby(level=level).sum()
+    table['Conversion_Rate'] = (table['Conversions'] / table['Users']).round(4) * 100
+    return table
 
 # Conversion rates by day of week
-print("\n📊 Conversion Rates by Day of Week:")
-day_conversion = df.groupby('most ads day').agg({
-    'converted': ['count', 'sum', 'mean']
-}).round(4)
-day_conversion.columns = ['Users', 'Conversions', 'Conversion_Rate']
-day_conversion['Conversion_Rate'] = day_conversion['Conversion_Rate'] * 100
-print(day_conversion.sort_index())
+out.append("\n📊 Conversion Rates by Day of Week:")
+day_conversion = conversion_rollup('most ads day')
+out.append(str(day_conversion))
 
 # Conversion rates by hour
-print("\n📊 Conversion Rates by Hour:")
-hour_conversion = df.groupby('most ads hour').agg({
-    'converted': ['count', 'sum', 'mean']
-}).round(4)
-hour_conversion.columns = ['Users', 'Conversions', 'Conversion_Rate']
-hour_conversion['Conversion_Rate'] = hour_conversion['Conversion_Rate'] * 100
-print(hour_conversion.sort_index().head(10))
+out.append("\n📊 Conversion Rates by Hour:")
+hour_conversion = conversion_rollup('most ads hour')
+out.append(str(hour_conversion.head(10)))
 
 # Day and hour combination analysis
-print("\n📊 Conversion Rates by Day and Hour (Top 10):")
-day_hour_conversion = df.groupby(['most ads day', 'most ads hour']).agg({
-    'converted': ['count', 'sum', 'mean']
-}).round(4)
-day_hour_conversion.columns = ['Users', 'Conversions', 'Conversion_Rate']
-day_hour_conversion['Conversion_Rate'] = day_hour_conversion['Conversion_Rate'] * 100
+out.append("\n📊 Conversion Rates by Day and Hour (Top 10):")
+day_hour_conversion = conversion_rollup(['most ads day', 'most ads hour'])
 day_hour_conversion = day_hour_conversion.sort_values('Conversion_Rate', ascending=False)
-print(day_hour_conversion.head(10))
+out.append(str(day_hour_conversion.head(10)))
 
 # Temporal patterns by group
-print("\n📊 Temporal Patterns by Test Group:")
-print("\n   By Day of Week:")
-day_group = df.groupby(['test group', 'most ads day'])['converted'].agg(['count', 'sum', 'mean']).round(4)
-day_group.columns = ['Users', 'Conversions', 'Conversion_Rate']
-day_group['Conversion_Rate'] = day_group['Conversion_Rate'] * 100
-print(day_group)
-
-print("\n   By Hour (Sample):")
-hour_group = df.groupby(['test group', 'most ads hour'])['converted'].agg(['count', 'sum', 'mean']).round(4)
-hour_group.columns = ['Users', 'Conversions', 'Conversion_Rate']
-hour_group['Conversion_Rate'] = hour_group['Conversion_Rate'] * 100
-print(hour_group.head(20))
+out.append("\n📊 Temporal Patterns by Test Group:")
+out.append("\n   By Day of Week:")
+day_group = conversion_rollup(['test group', 'most ads day'])
+out.append(str(day_group))
+
+out.append("\n   By Hour (Sample):")
+hour_group = conversion_rollup(['test group', 'most ads hour'])
+out.append(str(hour_group.head(20)))
+
+flush_output()
 
 # ============================================================================
 # 8. VISUALIZATION RECOMMENDATIONS
 # ============================================================================
 
-print("\n" + "="*80)
-print("KEY INSIGHTS & NEXT STEPS")
-print("="*80)
+out.append("\n" + "="*80)
+out.append("KEY INSIGHTS & NEXT STEPS")
+out.append("="*80)
 
-print("\n✅ Data Quality Summary:")
-print(f"   • Dataset is clean with {len(df):,} unique users")
-print(f"   • No missing values or duplicates")
-print(f"   • Groups are {'balanced' if 0.45 <= ad_ratio <= 0.55 else 'unbalanced'}")
+out.append("\n✅ Data Quality Summary:")
+out.append(f"   • Dataset is clean with {len(df):,} unique users")
+out.append(f"   • No missing values or duplicates")
+out.append(f"   • Groups are {'balanced' if 0.45 <= ad_ratio <= 0.55 else 'unbalanced'}")
 
-print("\n📊 Conversion Insights:")
-print(f"   • Overall conversion rate: {overall_cr:.2%}")
-print(f"   • Ad group converts at {cr_ad:.2%}")
-print(f"   • PSA group converts at {cr_psa:.2%}")
-print(f"   • Observed lift: {lift:+.2f}%")
+out.append("\n📊 Conversion Insights:")
+out.append(f"   • Overall conversion rate: {overall_cr:.2%}")
+out.append(f"   • Ad group converts at {cr_ad:.2%}")
+out.append(f"   • PSA group converts at {cr_psa:.2%}")
+out.append(f"   • Observed lift: {lift:+.2f}%")
 
-print("\n🔍 Recommended Analyses:")
-print("   1. Statistical significance testing (t-test, chi-square)")
-print("   2. Bayesian A/B test for probability estimates")
-print("   3. Temporal pattern analysis (day/hour effects)")
-print("   4. Dose-response analysis (ads vs conversion)")
-print("   5. Cohort segmentation for heterogeneous effects")
+out.append("\n🔍 Recommended Analyses:")
+out.append("   1. Statistical significance testing (t-test, chi-square)")
+out.append("   2. Bayesian A/B test for probability estimates")
+out.append("   3. Temporal pattern analysis (day/hour effects)")
+out.append("   4. Dose-response analysis (ads vs conversion)")
+out.append("   5. Cohort segmentation for heterogeneous effects")
 
-print("\n" + "="*80)
-print("EDA COMPLETE ✓")
-print("="*80)
+out.append("\n" + "="*80)
+out.append("EDA COMPLETE ✓")
+out.append("="*80)
+
+flush_output()
 
 # ============================================================================
 # 9. SAVE SUMMARY STATISTICS
@@ -321,4 +378,6 @@ summary_stats = {
     'correlation_ads_conversion': correlation
 }
 
-print("\n💾 Summary statistics saved for next analysis phase")
+out.append("\n💾 Summary statistics saved for next analysis phase")
+
+flush_output()
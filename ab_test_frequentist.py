@@ -11,36 +11,41 @@ This notebook performs comprehensive frequentist statistical testing including:
 
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
 from scipy import stats
-from scipy.stats import chi2_contingency
-from statsmodels.stats.power import TTestIndPower
 import warnings
+import sys
+from functools import lru_cache
 warnings.filterwarnings('ignore')
 
-# Set style
-plt.style.use('seaborn-v0_8-darkgrid')
-sns.set_palette("husl")
+# Random number generator (seeded so bootstrap results are reproducible run-to-run)
+rng = np.random.default_rng(20260408)
+
+# Report lines are buffered per section and written to stdout in one call
+out = []
+
+def flush_output():
+    """Write the buffered report lines to stdout and clear the buffer"""
+    sys.stdout.write('\n'.join(out) + '\n')
+    out.clear()
 
 # ============================================================================
 # 1. DATA LOADING
 # ============================================================================
 
-print("="*80)
-print("MARKETING A/B TEST - FREQUENTIST STATISTICAL ANALYSIS")
-print("="*80)
+out.append("="*80)
+out.append("MARKETING A/B TEST - FREQUENTIST STATISTICAL ANALYSIS")
+out.append("="*80)
 
-# Load data
-df = pd.read_csv('marketing_AB.csv')
+# Load data (typed Parquet copy written by ab_test_prepare_data.py)
+df = pd.read_parquet('marketing_AB.parquet', columns=['test group', 'converted'])
 
 # Separate groups
 ad_group = df[df['test group'] == 'ad']
 psa_group = df[df['test group'] == 'psa']
 
 # Extract conversion data
-ad_conversions = ad_group['converted'].values
-psa_conversions = psa_group['converted'].values
+ad_conversions = ad_group['converted'].to_numpy(np.int8)
+psa_conversions = psa_group['converted'].to_numpy(np.int8)
 
 # Calculate conversion rates
 cr_ad = ad_conversions.mean()
@@ -48,47 +53,53 @@ cr_psa = psa_conversions.mean()
 n_ad = len(ad_conversions)
 n_psa = len(psa_conversions)
 
-print(f"\n📊 Sample Sizes:")
-print(f"   Ad Group:  {n_ad:,}")
-print(f"   PSA Group: {n_psa:,}")
+out.append(f"\n📊 Sample Sizes:")
+out.append(f"   Ad Group:  {n_ad:,}")
+out.append(f"   PSA Group: {n_psa:,}")
+
+out.append(f"\n📈 Conversion Rates:")
+out.append(f"   Ad Group:  {cr_ad:.6f} ({cr_ad*100:.4f}%)")
+out.append(f"   PSA Group: {cr_psa:.6f} ({cr_psa*100:.4f}%)")
+out.append(f"   Difference: {cr_ad - cr_psa:.6f} ({(cr_ad - cr_psa)*100:.4f}%)")
+out.append(f"   Relative Lift: {((cr_ad - cr_psa) / cr_psa * 100):.4f}%")
 
-print(f"\n📈 Conversion Rates:")
-print(f"   Ad Group:  {cr_ad:.6f} ({cr_ad*100:.4f}%)")
-print(f"   PSA Group: {cr_psa:.6f} ({cr_psa*100:.4f}%)")
-print(f"   Difference: {cr_ad - cr_psa:.6f} ({(cr_ad - cr_psa)*100:.4f}%)")
-print(f"   Relative Lift: {((cr_ad - cr_psa) / cr_psa * 100):.4f}%")
+flush_output()
 
 # ============================================================================
 # 2. TWO-SAMPLE T-TEST
 # ============================================================================
 
-print("\n" + "="*80)
-print("TWO-SAMPLE T-TEST")
-print("="*80)
+out.append("\n" + "="*80)
+out.append("TWO-SAMPLE T-TEST")
+out.append("="*80)
 
-# Perform t-test (unequal variances)
-t_stat, p_value = stats.ttest_ind(ad_conversions, psa_conversions, equal_var=False)
+# Sample variances (ddof=1) in closed form: for 0/1 data var = p(1-p) * n/(n-1)
+var_ad = cr_ad * (1 - cr_ad) * n_ad / (n_ad - 1)
+var_psa = cr_psa * (1 - cr_psa) * n_psa / (n_psa - 1)
 
-# Calculate standard errors
-se_ad = np.std(ad_conversions, ddof=1) / np.sqrt(n_ad)
-se_psa = np.std(psa_conversions, ddof=1) / np.sqrt(n_psa)
-se_diff = np.sqrt(se_ad**2 + se_psa**2)
+# Calculate squared standard errors once; each appears in se_diff and df_welch
+va = var_ad / n_ad
+vb = var_psa / n_psa
+var_diff = va + vb
+se_diff = np.sqrt(var_diff)
 
 # Degrees of freedom (Welch's approximation)
-var_ad = np.var(ad_conversions, ddof=1)
-var_psa = np.var(psa_conversions, ddof=1)
-df_welch = (se_ad**2 + se_psa**2)**2 / (se_ad**4/(n_ad-1) + se_psa**4/(n_psa-1))
+df_welch = var_diff * var_diff / (va * va / (n_ad - 1) + vb * vb / (n_psa - 1))
+
+# Welch's t-test (unequal variances), same statistic as stats.ttest_ind(equal_var=False)
+t_stat = (cr_ad - cr_psa) / se_diff
+p_value = 2 * stats.t.sf(abs(t_stat), df_welch)
 
 # 95% Confidence interval
 ci_95_lower = (cr_ad - cr_psa) - stats.t.ppf(0.975, df_welch) * se_diff
 ci_95_upper = (cr_ad - cr_psa) + stats.t.ppf(0.975, df_welch) * se_diff
 
-print(f"\n📊 Test Results:")
-print(f"   T-statistic: {t_stat:.6f}")
-print(f"   P-value: {p_value:.6f}")
-print(f"   Degrees of Freedom (Welch): {df_welch:.2f}")
-print(f"   95% CI for difference: [{ci_95_lower:.6f}, {ci_95_upper:.6f}]")
-print(f"   95% CI for difference (%): [{(ci_95_lower*100):.4f}%, {(ci_95_upper*100):.4f}%]")
+out.append(f"\n📊 Test Results:")
+out.append(f"   T-statistic: {t_stat:.6f}")
+out.append(f"   P-value: {p_value:.6f}")
+out.append(f"   Degrees of Freedom (Welch): {df_welch:.2f}")
+out.append(f"   95% CI for difference: [{ci_95_lower:.6f}, {ci_95_upper:.6f}]")
+out.append(f"   95% CI for difference (%): [{(ci_95_lower*100):.4f}%, {(ci_95_upper*100):.4f}%]")
 
 # Interpretation
 alpha = 0.05
@@ -99,53 +110,71 @@ else:
     significance = "Not Statistically Significant"
     symbol = "⚠️"
 
-print(f"\n{symbol} Interpretation:")
-print(f"   {significance} (p < {alpha})")
+out.append(f"\n{symbol} Interpretation:")
+out.append(f"   {significance} (p < {alpha})")
 if p_value < 0.001:
-    print(f"   Highly significant (p < 0.001)")
+    out.append(f"   Highly significant (p < 0.001)")
 elif p_value < 0.01:
-    print(f"   Very significant (p < 0.01)")
+    out.append(f"   Very significant (p < 0.01)")
 elif p_value < 0.05:
-    print(f"   Significant (p < 0.05)")
+    out.append(f"   Significant (p < 0.05)")
 elif p_value < 0.10:
-    print(f"   Marginally significant (p < 0.10)")
+    out.append(f"   Marginally significant (p < 0.10)")
+
+flush_output()
 
 # ============================================================================
 # 3. CHI-SQUARE TEST
 # ============================================================================
 
-print("\n" + "="*80)
-print("CHI-SQUARE TEST FOR INDEPENDENCE")
-print("="*80)
-
-# Create contingency table
-contingency_table = pd.crosstab(df['test group'], df['converted'])
-print("\n📊 Contingency Table:")
-print(contingency_table)
-
-# Perform chi-square test
-chi2, p_chi2, dof, expected = chi2_contingency(contingency_table)
-
-print(f"\n📊 Chi-Square Test Results:")
-print(f"   Chi-square statistic: {chi2:.6f}")
-print(f"   P-value: {p_chi2:.6f}")
-print(f"   Degrees of Freedom: {dof}")
-print(f"\n   Expected Frequencies:")
-print(pd.DataFrame(expected, index=contingency_table.index, columns=contingency_table.columns))
+out.append("\n" + "="*80)
+out.append("CHI-SQUARE TEST FOR INDEPENDENCE")
+out.append("="*80)
+
+# Create contingency table: histogram of (group code, converted) pairs
+group_labels = df['test group'].cat.categories
+group_codes = df['test group'].cat.codes.to_numpy(np.int8)
+converted = df['converted'].to_numpy(np.int8)
+ct = np.bincount(group_codes * 2 + converted, minlength=2 * len(group_labels)).reshape(-1, 2)
+contingency_table = pd.DataFrame(
+    ct,
+    index=pd.Index(group_labels, name='test group'),
+    columns=pd.Index([False, True], name='converted')
+)
+out.append("\n📊 Contingency Table:")
+out.append(str(contingency_table))
+
+# Perform chi-square test (closed form for a 2x2 table, with Yates'
+# continuity correction as applied by scipy's chi2_contingency)
+(a, b), (c, d) = ct.astype(float)
+n_total = a + b + c + d
+chi2 = n_total * max(abs(a * d - b * c) - n_total / 2, 0)**2 / ((a + b) * (c + d) * (a + c) * (b + d))
+dof = 1
+p_chi2 = stats.chi2.sf(chi2, dof)
+expected = np.outer(ct.sum(axis=1), ct.sum(axis=0)) / n_total
+
+out.append(f"\n📊 Chi-Square Test Results:")
+out.append(f"   Chi-square statistic: {chi2:.6f}")
+out.append(f"   P-value: {p_chi2:.6f}")
+out.append(f"   Degrees of Freedom: {dof}")
+out.append(f"\n   Expected Frequencies:")
+out.append(str(pd.DataFrame(expected, index=contingency_table.index, columns=contingency_table.columns)))
 
 # Interpretation
 if p_chi2 < alpha:
-    print(f"\n✅ Groups are NOT independent (significant association)")
+    out.append(f"\n✅ Groups are NOT independent (significant association)")
 else:
-    print(f"\n⚠️  Groups appear independent (no significant association)")
+    out.append(f"\n⚠️  Groups appear independent (no significant association)")
+
+flush_output()
 
 # ============================================================================
 # 4. EFFECT SIZE (COHEN'S H)
 # ============================================================================
 
-print("\n" + "="*80)
-print("EFFECT SIZE CALCULATION")
-print("="*80)
+out.append("\n" + "="*80)
+out.append("EFFECT SIZE CALCULATION")
+out.append("="*80)
 
 # Cohen's h for proportions (arcsine transformation)
 def cohens_h(p1, p2):
@@ -160,9 +189,9 @@ cohens_d = (cr_ad - cr_psa) / pooled_std if pooled_std > 0 else 0
 # Cohen's h
 cohens_h_value = cohens_h(cr_ad, cr_psa)
 
-print(f"\n📊 Effect Size Metrics:")
-print(f"   Cohen's h: {cohens_h_value:.6f}")
-print(f"   Cohen's d: {cohens_d:.6f}")
+out.append(f"\n📊 Effect Size Metrics:")
+out.append(f"   Cohen's h: {cohens_h_value:.6f}")
+out.append(f"   Cohen's d: {cohens_d:.6f}")
 
 # Interpretation
 def interpret_effect_size_h(h):
@@ -178,99 +207,151 @@ def interpret_effect_size_h(h):
         return "Large"
 
 effect_interpretation = interpret_effect_size_h(cohens_h_value)
-print(f"\n📈 Effect Size Interpretation:")
-print(f"   {effect_interpretation} effect (|h| = {abs(cohens_h_value):.4f})")
+out.append(f"\n📈 Effect Size Interpretation:")
+out.append(f"   {effect_interpretation} effect (|h| = {abs(cohens_h_value):.4f})")
+
+flush_output()
 
 # ============================================================================
 # 5. BOOTSTRAP CONFIDENCE INTERVALS
 # ============================================================================
 
-print("\n" + "="*80)
-print("BOOTSTRAP CONFIDENCE INTERVALS")
-print("="*80)
-
-def bootstrap_ci(data1, data2, n_bootstrap=10000, ci_level=0.95):
+out.append("\n" + "="*80)
+out.append("BOOTSTRAP CONFIDENCE INTERVALS")
+out.append("="*80)
+
+@lru_cache(maxsize=None)
+def _block_bootstrap_kernel():
+    """Compile the parallel moving-block bootstrap on first use (None without Numba)"""
+    try:
+        from numba import njit, prange
+    except ImportError:  # Numba is optional; resampling falls back to NumPy
+        return None
+
+    # Parallel over resamples with no index arrays. Each resample reseeds
+    # Numba's RNG from its own seed (drawn from `rng`), so the draws do not
+    # depend on which thread runs which resample.
+    @njit(parallel=True, cache=True)
+    def block_bootstrap_means(data, seeds, block_size):
+        """Means of moving-block resamples of data, one resample per seed"""
+        n = len(data)
+        n_bootstrap = len(seeds)
+        means = np.empty(n_bootstrap)
+        for b in prange(n_bootstrap):
+            np.random.seed(seeds[b])
+            total = 0.0
+            filled = 0
+            while filled < n:
+                start = np.random.randint(0, n - block_size + 1)
+                take = min(block_size, n - filled)
+                for k in range(take):
+                    total += data[start + k]
+                filled += take
+            means[b] = total / n
+        return means
+
+    return block_bootstrap_means
+
+def bootstrap_means(data, n_bootstrap, rng, block_size=1):
+    """Bootstrap distribution of the mean of data (one mean per resample)"""
+    n = len(data)
+    if not 1 <= block_size <= n:
+        raise ValueError(f"block_size must be between 1 and len(data) ({n}), got {block_size}")
+    if block_size == 1 and np.isin(data, (0, 1)).all():
+        # For 0/1 data the mean of n resampled values is Binomial(n, p_hat) / n
+        return rng.binomial(n, data.mean(), size=n_bootstrap) / n
+    # Moving-block bootstrap: concatenate runs of block_size consecutive rows
+    # from uniform block starts (block_size=1 is the ordinary IID bootstrap).
+    # Numba is imported only here, so the 0/1 path above never pays for it
+    kernel = _block_bootstrap_kernel()
+    if kernel is not None:
+        seeds = rng.integers(0, 2**32, size=n_bootstrap)
+        return kernel(data, seeds, block_size)
+    # NumPy fallback: resample a batch of rows at a time to bound memory
+    n_blocks = -(-n // block_size)
+    offsets = np.arange(block_size)
+    means = np.empty(n_bootstrap)
+    batch = max(1, 2**22 // n)
+    for start in range(0, n_bootstrap, batch):
+        stop = min(start + batch, n_bootstrap)
+        starts = rng.integers(0, n - block_size + 1, size=(stop - start, n_blocks))
+        idx = (starts[..., None] + offsets).reshape(stop - start, -1)[:, :n]
+        means[start:stop] = data[idx].mean(axis=1)
+    return means
+
+def bootstrap_ci(data1, data2, n_bootstrap=10000, ci_level=0.95, rng=None, block_size=1):
     """Calculate bootstrap confidence interval for difference in means"""
-    n1, n2 = len(data1), len(data2)
-    differences = []
-    
-    for _ in range(n_bootstrap):
-        # Resample with replacement
-        sample1 = np.random.choice(data1, size=n1, replace=True)
-        sample2 = np.random.choice(data2, size=n2, replace=True)
-        # Calculate difference
-        diff = sample1.mean() - sample2.mean()
-        differences.append(diff)
-    
-    differences = np.array(differences)
+    if rng is None:
+        rng = np.random.default_rng()
+    differences = (bootstrap_means(data1, n_bootstrap, rng, block_size)
+                   - bootstrap_means(data2, n_bootstrap, rng, block_size))
+
     alpha = 1 - ci_level
-    lower = np.percentile(differences, 100 * alpha/2)
-    upper = np.percentile(differences, 100 * (1 - alpha/2))
-    
+    lower, upper = np.percentile(differences, [100 * alpha/2, 100 * (1 - alpha/2)])
+
     return lower, upper, differences
 
-print(f"\n🔄 Running Bootstrap (10,000 iterations)...")
+out.append(f"\n🔄 Running Bootstrap (10,000 iterations)...")
+flush_output()
 bootstrap_lower, bootstrap_upper, bootstrap_diffs = bootstrap_ci(
-    ad_conversions, psa_conversions, n_bootstrap=10000, ci_level=0.95
+    ad_conversions, psa_conversions, n_bootstrap=10000, ci_level=0.95, rng=rng
 )
 
-print(f"\n📊 Bootstrap Results:")
-print(f"   95% CI for difference: [{bootstrap_lower:.6f}, {bootstrap_upper:.6f}]")
-print(f"   95% CI for difference (%): [{(bootstrap_lower*100):.4f}%, {(bootstrap_upper*100):.4f}%]")
-print(f"   Bootstrap mean difference: {bootstrap_diffs.mean():.6f}")
-print(f"   Bootstrap std error: {bootstrap_diffs.std():.6f}")
+out.append(f"\n📊 Bootstrap Results:")
+out.append(f"   95% CI for difference: [{bootstrap_lower:.6f}, {bootstrap_upper:.6f}]")
+out.append(f"   95% CI for difference (%): [{(bootstrap_lower*100):.4f}%, {(bootstrap_upper*100):.4f}%]")
+out.append(f"   Bootstrap mean difference: {bootstrap_diffs.mean():.6f}")
+out.append(f"   Bootstrap std error: {bootstrap_diffs.std():.6f}")
+
+flush_output()
 
 # ============================================================================
 # 6. POWER ANALYSIS
 # ============================================================================
 
-print("\n" + "="*80)
-print("STATISTICAL POWER ANALYSIS")
-print("="*80)
+out.append("\n" + "="*80)
+out.append("STATISTICAL POWER ANALYSIS")
+out.append("="*80)
 
 # Observed effect size
 observed_effect = cr_ad - cr_psa
 
-# Calculate achieved power
-power_analysis = TTestIndPower()
-achieved_power = power_analysis.power(
-    effect_size=cohens_d,
-    nobs1=n_ad,
-    ratio=n_psa/n_ad,
-    alpha=0.05,
-    alternative='two-sided'
-)
+# Normal-approximation power (two-sided, alpha = 0.05); at these sample
+# sizes the t distribution is indistinguishable from the normal
+z_alpha = stats.norm.ppf(0.975)
+z_beta = stats.norm.ppf(0.80)
 
-print(f"\n📊 Power Analysis Results:")
-print(f"   Observed effect size (Cohen's d): {cohens_d:.6f}")
-print(f"   Sample size (Ad): {n_ad:,}")
-print(f"   Sample size (PSA): {n_psa:,}")
-print(f"   Achieved power: {achieved_power:.4f} ({achieved_power*100:.2f}%)")
-
-# Calculate required sample size for 80% power
-required_n = power_analysis.solve_power(
-    effect_size=cohens_d,
-    power=0.80,
-    ratio=1.0,
-    alpha=0.05,
-    alternative='two-sided'
-)
+# Calculate achieved power: d scaled by the effective size n_ad*n_psa/(n_ad+n_psa)
+shift = abs(cohens_d) * np.sqrt(n_ad * n_psa / (n_ad + n_psa))
+achieved_power = stats.norm.cdf(shift - z_alpha) + stats.norm.cdf(-shift - z_alpha)
+
+out.append(f"\n📊 Power Analysis Results:")
+out.append(f"   Observed effect size (Cohen's d): {cohens_d:.6f}")
+out.append(f"   Sample size (Ad): {n_ad:,}")
+out.append(f"   Sample size (PSA): {n_psa:,}")
+out.append(f"   Achieved power: {achieved_power:.4f} ({achieved_power*100:.2f}%)")
 
-print(f"\n📈 Sample Size Requirements:")
-print(f"   Required sample size per group (80% power): {int(np.ceil(required_n)):,}")
-print(f"   Current sample size (Ad): {n_ad:,}")
+# Calculate required sample size per group for 80% power (equal groups);
+# the z_alpha**2 / 4 term is Guenther's correction for using t instead of z
+required_n = 2 * ((z_alpha + z_beta) / cohens_d)**2 + z_alpha**2 / 4
+
+out.append(f"\n📈 Sample Size Requirements:")
+out.append(f"   Required sample size per group (80% power): {int(np.ceil(required_n)):,}")
+out.append(f"   Current sample size (Ad): {n_ad:,}")
 if n_ad >= required_n:
-    print(f"   ✅ Sample size is adequate")
+    out.append(f"   ✅ Sample size is adequate")
 else:
-    print(f"   ⚠️  Sample size may be insufficient")
+    out.append(f"   ⚠️  Sample size may be insufficient")
+
+flush_output()
 
 # ============================================================================
 # 7. SUMMARY STATISTICS
 # ============================================================================
 
-print("\n" + "="*80)
-print("SUMMARY STATISTICS")
-print("="*80)
+out.append("\n" + "="*80)
+out.append("SUMMARY STATISTICS")
+out.append("="*80)
 
 summary = {
     'ad_group_size': n_ad,
@@ -294,22 +375,36 @@ summary = {
     'is_significant': p_value < 0.05
 }
 
-print("\n📋 Key Metrics:")
+out.append("\n📋 Key Metrics:")
 for key, value in summary.items():
     if isinstance(value, float):
-        print(f"   {key}: {value:.6f}")
+        out.append(f"   {key}: {value:.6f}")
     else:
-        print(f"   {key}: {value}")
+        out.append(f"   {key}: {value}")
+
+flush_output()
+
+def _np_default(o):
+    """JSON fallback for NumPy scalars and arrays"""
+    if isinstance(o, np.bool_):
+        return bool(o)
+    if isinstance(o, np.integer):
+        return int(o)
+    if isinstance(o, np.floating):
+        return float(o)
+    if isinstance(o, np.ndarray):
+        return o.tolist()
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
 
 # Save summary
 import json
 with open('frequentist_results.json', 'w') as f:
-    json.dump({k: float(v) if isinstance(v, (np.integer, np.floating)) else v 
-              for k, v in summary.items()}, f, indent=2)
+    json.dump(summary, f, indent=2, default=_np_default)
 
-print("\n💾 Results saved to 'frequentist_results.json'")
+out.append("\n💾 Results saved to 'frequentist_results.json'")
 
-print("\n" + "="*80)
-print("FREQUENTIST ANALYSIS COMPLETE ✓")
-print("="*80)
+out.append("\n" + "="*80)
+out.append("FREQUENTIST ANALYSIS COMPLETE ✓")
+out.append("="*80)
 
+flush_output()
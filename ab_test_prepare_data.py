@@ -0,0 +1,39 @@
+"""
+Marketing A/B Test - Data Preparation
+======================================
+Converts the raw campaign CSV into a typed Parquet file once, so the
+analysis scripts load a columnar copy instead of re-parsing the CSV:
+- Low-cardinality string columns stored as categories
+- Compact integer / boolean dtypes
+"""
+
+import pandas as pd
+
+# ============================================================================
+# 1. CSV -> PARQUET
+# ============================================================================
+
+print("="*80)
+print("MARKETING A/B TEST - DATA PREPARATION")
+print("="*80)
+
+# Load raw data (update path as needed) with pyarrow's multi-threaded reader
+df = pd.read_csv(
+    'marketing_AB.csv',
+    engine='pyarrow',
+    dtype={
+        'test group': 'category',
+        'converted': 'bool',
+        'total ads': 'int32',
+        'most ads day': 'category',
+        'most ads hour': 'int8'
+    }
+)
+# pyarrow leaves the blank index header empty; keep the C engine's name for it
+df = df.rename(columns={'': 'Unnamed: 0'})
+
+df.to_parquet('marketing_AB.parquet', index=False)
+
+print(f"\n📊 Records: {len(df):,}")
+print(f"   Columns: {list(df.columns)}")
+print("\n💾 Data saved to 'marketing_AB.parquet'")